@@ -1,11 +1,22 @@
-from flask import Flask
+import os
+
 
 def create_app():
     """Create and configure the Flask application."""
+    # Flask is imported here rather than at module level so that the
+    # simulator core (app.models, app.utils, app.cli) can be imported
+    # without pulling in the web framework.
+    from flask import Flask
+
     app = Flask(__name__, instance_relative_config=False)
     # minimal config
     app.config.from_mapping(
         SECRET_KEY="dev",
+        # Results of /api/run are memoized; set the TM_RUN_CACHE_DB
+        # environment variable to a file path to keep them in SQLite
+        # across restarts
+        RUN_CACHE_SIZE=256,
+        RUN_CACHE_DB=os.environ.get("TM_RUN_CACHE_DB"),
     )
 
     # import and register blueprints lazily
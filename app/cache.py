@@ -0,0 +1,243 @@
+"""
+Content-addressed cache of TuringMachine.run results.
+
+Results are keyed by a canonical hash of the MachineDefinition, the initial
+tape and the step budget. A run that halted is stored without its budget, so
+it also answers any larger budget. Entries live in an in-memory LRU and can
+additionally be written to a SQLite file shared between processes.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from .models import HistoryEntry, MachineDefinition, MachineState, TuringMachine
+
+# Budget column value for halted runs, which answer any larger budget
+HALTED = -1
+
+
+def definition_hash(definition: MachineDefinition) -> str:
+    """Return a hash that is equal for definitions that behave identically."""
+    table = definition.transition_table
+    if table is None:
+        # First matching transition wins, as in TuringMachine
+        table = {}
+        for t in definition.transitions:
+            table.setdefault((t.current_state, t.read_symbol), t)
+
+    canonical = {
+        "states": sorted(definition.states),
+        "input_alphabet": sorted(definition.input_alphabet),
+        "tape_alphabet": sorted(definition.tape_alphabet),
+        "blank": definition.blank,
+        "initial_state": definition.initial_state,
+        "final_states": sorted(definition.final_states),
+        "transitions": sorted(
+            (t.current_state, t.read_symbol, t.next_state, t.write_symbol, t.move.value)
+            for t in table.values()
+        ),
+    }
+    encoded = json.dumps(canonical, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class CachedRun:
+    budget: int
+    halted: bool
+    steps: int
+    current_state: str
+    head_position: int
+    tape: Tuple[Tuple[int, str], ...]
+    history: Optional[bytes]  # zlib-compressed JSON, if history is stored
+
+    def answers(self, max_steps: int) -> bool:
+        """Whether running with max_steps would end in this same configuration."""
+        if self.budget == max_steps:
+            return True
+        # A halted run stops at the same step given any budget that reaches it
+        return self.halted and (max_steps >= self.budget or max_steps > self.steps)
+
+
+def _encode_history(history) -> bytes:
+    rows = [list(entry) for entry in history]
+    return zlib.compress(json.dumps(rows, ensure_ascii=False).encode("utf-8"))
+
+
+def _decode_history(data: bytes):
+    return [
+        HistoryEntry(step, state, symbol, head, tuple(tape), min_index, max_index)
+        for step, state, symbol, head, tape, min_index, max_index
+        in json.loads(zlib.decompress(data))
+    ]
+
+
+class RunCache:
+    """LRU cache of run results with an optional SQLite tier."""
+
+    def __init__(self, max_entries: int = 256, path: Optional[str] = None, store_history: bool = True):
+        self.max_entries = max_entries
+        self.store_history = store_history
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, CachedRun]" = OrderedDict()
+        # id(definition) -> (definition, hash); the reference keeps the id valid
+        self._hashes: "OrderedDict[int, Tuple[MachineDefinition, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                " definition TEXT, tape TEXT, budget INTEGER, result TEXT, history BLOB,"
+                " PRIMARY KEY (definition, tape, budget))"
+            )
+            self._db.commit()
+
+    def run(self, machine: TuringMachine, max_steps: int = 1000) -> bool:
+        """
+        Run machine like TuringMachine.run, reusing a cached result if possible.
+        Only runs that start from a freshly reset machine are cached.
+        """
+        if machine.state.steps or machine.state.halted:
+            return machine.run(max_steps)
+
+        key = (self._hash(machine.definition), machine.initial_tape)
+        with self._lock:
+            entry = self._lookup(key, max_steps)
+            if entry is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is not None:
+            self._restore(machine, entry)
+            return machine.state.halted
+
+        halted = machine.run(max_steps)
+        with self._lock:
+            self._store(key, self._capture(machine, max_steps))
+        return halted
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "persistent": self._db is not None,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM runs")
+                self._db.commit()
+        self.hits = self.misses = 0
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _hash(self, definition: MachineDefinition) -> str:
+        cached = self._hashes.get(id(definition))
+        if cached is not None and cached[0] is definition:
+            return cached[1]
+        digest = definition_hash(definition)
+        self._hashes[id(definition)] = (definition, digest)
+        if len(self._hashes) > 32:
+            self._hashes.popitem(last=False)
+        return digest
+
+    def _lookup(self, key: tuple, max_steps: int) -> Optional[CachedRun]:
+        # A halted result is preferred: it covers every budget that reaches it
+        for budget in (HALTED, max_steps):
+            entry = self._entries.get(key + (budget,))
+            if entry is None:
+                entry = self._load(key, budget)
+                if entry is not None:
+                    self._remember(key + (budget,), entry)
+            else:
+                self._entries.move_to_end(key + (budget,))
+            if entry is None or not entry.answers(max_steps):
+                continue
+            if self.store_history and entry.history is None:
+                continue
+            return entry
+        return None
+
+    def _store(self, key: tuple, entry: CachedRun) -> None:
+        budget = HALTED if entry.halted else entry.budget
+        self._remember(key + (budget,), entry)
+        if self._db is None:
+            return
+        definition, tape = key
+        result = {
+            "budget": entry.budget,
+            "halted": entry.halted,
+            "steps": entry.steps,
+            "current_state": entry.current_state,
+            "head_position": entry.head_position,
+            "tape": entry.tape,
+        }
+        self._db.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)",
+            (definition, json.dumps(tape, ensure_ascii=False), budget,
+             json.dumps(result, ensure_ascii=False), entry.history),
+        )
+        self._db.commit()
+
+    def _load(self, key: tuple, budget: int) -> Optional[CachedRun]:
+        if self._db is None:
+            return None
+        definition, tape = key
+        row = self._db.execute(
+            "SELECT result, history FROM runs WHERE definition = ? AND tape = ? AND budget = ?",
+            (definition, json.dumps(tape, ensure_ascii=False), budget),
+        ).fetchone()
+        if row is None:
+            return None
+        result = json.loads(row[0])
+        return CachedRun(
+            budget=result["budget"],
+            halted=result["halted"],
+            steps=result["steps"],
+            current_state=result["current_state"],
+            head_position=result["head_position"],
+            tape=tuple((index, symbol) for index, symbol in result["tape"]),
+            history=row[1],
+        )
+
+    def _remember(self, key: tuple, entry: CachedRun) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _capture(self, machine: TuringMachine, max_steps: int) -> CachedRun:
+        return CachedRun(
+            budget=max_steps,
+            halted=machine.state.halted,
+            steps=machine.state.steps,
+            current_state=machine.state.current_state,
+            head_position=machine.state.head_position,
+            tape=tuple(machine.tape.items()),
+            history=_encode_history(machine.history) if self.store_history else None,
+        )
+
+    def _restore(self, machine: TuringMachine, entry: CachedRun) -> None:
+        machine.tape.clear()
+        machine.tape.update(entry.tape)
+        machine.state = MachineState(
+            head_position=entry.head_position,
+            current_state=entry.current_state,
+            halted=entry.halted,
+            steps=entry.steps,
+        )
+        if entry.history is not None:
+            machine.history[:] = _decode_history(entry.history)
@@ -0,0 +1,217 @@
+"""
+Command line interface for running machines without the web application.
+
+Only the simulator core (models, utils) is imported here, so
+``python -m app`` and its pool workers start without loading Flask,
+Werkzeug or Jinja.
+
+Usage:
+    python -m app run binary_incrementer 1011 --max-steps 500
+    printf '1\\n101\\n' | python -m app run binary_incrementer --batch --jobs 4
+    python -m app run binary_incrementer 1011 --cache runs.sqlite
+    python -m app run binary_incrementer 1011 --trace run.trace
+    python -m app replay run.trace --start 5 --count 3
+
+Each result is written to stdout as one JSON object per line (NDJSON).
+"""
+import argparse
+import json
+import os
+import sys
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+
+from .models import TuringMachine
+from .utils import load_machine_file
+
+if TYPE_CHECKING:
+    from .cache import RunCache
+
+MACHINES_DIR = "machines"
+
+# Machine and run cache created once per pool worker by _init_worker
+_worker_machine: Optional[TuringMachine] = None
+_worker_cache: Optional["RunCache"] = None
+
+
+def resolve_machine_path(machine: str) -> str:
+    """Accept either a path to a definition file or a machine id in MACHINES_DIR."""
+    if os.path.isfile(machine):
+        return machine
+    path = os.path.join(MACHINES_DIR, f"{machine}.txt")
+    if os.path.isfile(path):
+        return path
+    raise FileNotFoundError(f"Machine definition '{machine}' not found")
+
+
+def load_machine(machine: str) -> TuringMachine:
+    """Parse a machine definition file and build a TuringMachine from it."""
+    tm = load_machine_file(resolve_machine_path(machine))
+    # Results never include the history, so don't keep it in memory
+    tm.keep_history = False
+    return tm
+
+
+def open_cache(cache_path: Optional[str]) -> Optional["RunCache"]:
+    """Open the SQLite backed run cache; history is not needed for CLI output."""
+    if not cache_path:
+        return None
+    # Imported here so runs without --cache never load sqlite3 and hashlib
+    from .cache import RunCache
+    return RunCache(path=cache_path, store_history=False)
+
+
+def run_tape(machine: TuringMachine, tape: str, max_steps: int,
+             cache: Optional["RunCache"] = None, trace_path: Optional[str] = None) -> Dict[str, Any]:
+    """Run machine on a single input tape and return a JSON-serializable result."""
+    try:
+        machine.reset(list(tape))
+    except ValueError as e:
+        return {"input": tape, "error": str(e)}
+
+    result: Dict[str, Any] = {}
+    if trace_path is not None:
+        # Imported here so untraced runs never load lzma and mmap
+        from .trace import TraceWriter
+
+        with TraceWriter(trace_path, machine) as trace:
+            machine.run(max_steps)
+        result["trace"] = {"path": trace_path, "records": trace.records}
+    elif cache is None:
+        machine.run(max_steps)
+    else:
+        hits = cache.hits
+        cache.run(machine, max_steps)
+        result["cached"] = cache.hits > hits
+
+    tape_data = machine.get_tape_snapshot()
+    return {
+        "input": tape,
+        "halted": machine.state.halted,
+        "accepted": machine.state.current_state in machine.definition.final_states,
+        "current_state": machine.state.current_state,
+        "steps": machine.state.steps,
+        "head_position": machine.state.head_position,
+        "tape": tape_data["tape"],
+        "min_index": tape_data["min_index"],
+        "max_index": tape_data["max_index"],
+        **result,
+    }
+
+
+def _init_worker(path: str, cache_path: Optional[str]) -> None:
+    global _worker_machine, _worker_cache
+    _worker_machine = load_machine(path)
+    _worker_cache = open_cache(cache_path)
+
+
+def _run_in_worker(args) -> Dict[str, Any]:
+    tape, max_steps = args
+    return run_tape(_worker_machine, tape, max_steps, _worker_cache)
+
+
+def run_batch(path: str, tapes: Iterable[str], max_steps: int, jobs: int = 1,
+              cache_path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Run every tape through the machine, yielding results in input order."""
+    if jobs <= 1:
+        machine = load_machine(path)
+        cache = open_cache(cache_path)
+        try:
+            for tape in tapes:
+                yield run_tape(machine, tape, max_steps, cache)
+        finally:
+            if cache is not None:
+                cache.close()
+        return
+
+    # Imported here so single-process runs never pay for multiprocessing
+    from multiprocessing import Pool
+
+    # Fail fast in the parent: a worker initializer that raises would be
+    # respawned by the pool indefinitely
+    load_machine(path)
+    with Pool(jobs, initializer=_init_worker, initargs=(path, cache_path)) as pool:
+        work = ((tape, max_steps) for tape in tapes)
+        yield from pool.imap(_run_in_worker, work, chunksize=16)
+
+
+def read_tapes(stream) -> Iterator[str]:
+    """Yield one tape per input line; an empty line is an empty tape."""
+    for line in stream:
+        yield line.rstrip("\r\n")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app", description="Turing Machine Simulator")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run a machine on one or more input tapes")
+    run_parser.add_argument("machine", help="Machine id in machines/ or path to a definition file")
+    run_parser.add_argument("tape", nargs="?", default="", help="Initial tape content (ignored with --batch)")
+    run_parser.add_argument("--max-steps", type=int, default=1000, help="Step budget per tape (default: 1000)")
+    run_parser.add_argument("--batch", action="store_true", help="Read one tape per line from stdin")
+    run_parser.add_argument("--jobs", type=int, default=1, help="Worker processes for --batch (default: 1)")
+    run_parser.add_argument("--cache", metavar="FILE", help="SQLite file to reuse run results across invocations")
+    run_parser.add_argument("--trace", metavar="FILE", help="Record every step to a compressed trace file")
+
+    replay_parser = subparsers.add_parser("replay", help="Print steps of a recorded trace")
+    replay_parser.add_argument("trace", help="Trace file written by run --trace")
+    replay_parser.add_argument("--start", type=int, default=0, help="First record to print (default: 0)")
+    replay_parser.add_argument("--count", type=int, default=None, help="Number of records to print (default: all)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "replay":
+        return replay(args)
+    if args.trace and (args.batch or args.cache):
+        parser.error("--trace cannot be combined with --batch or --cache")
+
+    errors = (OSError, ValueError)
+    if args.cache:
+        import sqlite3
+        errors += (sqlite3.Error,)
+
+    try:
+        path = resolve_machine_path(args.machine)
+        if args.trace:
+            result = run_tape(load_machine(path), args.tape, args.max_steps, trace_path=args.trace)
+            sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+            return 1 if "error" in result else 0
+
+        tapes = read_tapes(sys.stdin) if args.batch else [args.tape]
+        failed = False
+        hits = misses = 0
+        jobs = args.jobs if args.batch else 1
+        for result in run_batch(path, tapes, args.max_steps, jobs, args.cache):
+            failed = failed or "error" in result
+            if "cached" in result:
+                hits += result["cached"]
+                misses += not result["cached"]
+            sys.stdout.write(json.dumps(result, ensure_ascii=False) + "\n")
+    except errors as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    if args.cache:
+        print(f"cache: {hits} hits, {misses} misses", file=sys.stderr)
+
+    return 1 if failed else 0
+
+
+def replay(args) -> int:
+    """Print records of a trace file as NDJSON history entries."""
+    from .trace import TraceReader
+
+    try:
+        with TraceReader(args.trace) as reader:
+            stop = None if args.count is None else args.start + args.count
+            for entry in reader.entries(args.start, stop):
+                record = entry._asdict()
+                record["tape"] = list(entry.tape)
+                sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
@@ -1,20 +1,38 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Optional, Any
+from typing import Callable, Dict, List, Set, Optional, NamedTuple, Tuple
 from enum import Enum
 
 class MoveDirection(Enum):
     LEFT = 'L'
     RIGHT = 'R'
 
-@dataclass
+# Head offset applied for each move direction
+MOVE_DELTAS = {MoveDirection.LEFT: -1, MoveDirection.RIGHT: 1}
+
+@dataclass(frozen=True, slots=True)
 class Transition:
     current_state: str
     read_symbol: str
     next_state: str
     write_symbol: str
     move: MoveDirection
+    # Precomputed head offset (-1 or +1) so stepping avoids comparing enums
+    delta: int = field(init=False, repr=False, compare=False)
 
-@dataclass
+    def __post_init__(self):
+        object.__setattr__(self, "delta", MOVE_DELTAS[self.move])
+
+class HistoryEntry(NamedTuple):
+    """Snapshot of the machine after a step; converted to JSON only by the API."""
+    step: int
+    current_state: str
+    current_symbol: str
+    head_position: int
+    tape: Tuple[str, ...]
+    min_index: int
+    max_index: int
+
+@dataclass(slots=True)
 class MachineDefinition:
     states: Set[str]
     input_alphabet: Set[str]
@@ -23,8 +41,10 @@ class MachineDefinition:
     blank: str
     initial_state: str
     final_states: Set[str]
+    # (current_state, read_symbol) -> Transition; built from transitions if not given
+    transition_table: Optional[Dict[Tuple[str, str], Transition]] = field(default=None, repr=False)
 
-@dataclass
+@dataclass(slots=True)
 class MachineState:
     head_position: int
     current_state: str
@@ -36,7 +56,14 @@ class TuringMachine:
     definition: MachineDefinition
     tape: Dict[int, str] = field(default_factory=dict)
     state: MachineState = field(init=False)
-    history: List[Dict[str, Any]] = field(default_factory=list, init=False)
+    history: List[HistoryEntry] = field(default_factory=list, init=False)
+    transition_table: Dict[Tuple[str, str], Transition] = field(default_factory=dict, init=False, repr=False)
+    # Tape the machine was last reset with; used as part of run cache keys
+    initial_tape: Tuple[str, ...] = field(default=(), init=False)
+    # Called with the machine whenever a step is recorded, e.g. TraceWriter.record
+    recorder: Optional[Callable[["TuringMachine"], None]] = field(default=None, init=False, repr=False)
+    # Long traced runs can turn off the in-memory history
+    keep_history: bool = field(default=True, init=False, repr=False)
     
     def __post_init__(self):
         self.validate_definition()
@@ -68,6 +95,15 @@ class TuringMachine:
             
             if transition.write_symbol not in self.definition.tape_alphabet:
                 raise ValueError(f"Write symbol '{transition.write_symbol}' not in tape alphabet")
+
+        if self.definition.transition_table is not None:
+            self.transition_table = self.definition.transition_table
+        else:
+            # First matching transition wins, as with a linear scan
+            self.transition_table = {}
+            for transition in self.definition.transitions:
+                key = (transition.current_state, transition.read_symbol)
+                self.transition_table.setdefault(key, transition)
     
     def reset(self, initial_tape: Optional[List[str]] = None):
         """Reset the machine with optional initial tape and clear history"""
@@ -78,6 +114,7 @@ class TuringMachine:
             if symbol not in self.definition.tape_alphabet:
                 raise ValueError(f"Initial tape symbol '{symbol}' not in tape alphabet")
             self.tape[index] = symbol
+        self.initial_tape = tuple(initial_tape)
 
         self.state = MachineState(
             head_position=0,
@@ -92,16 +129,22 @@ class TuringMachine:
 
     def record_history(self):
         """Append current machine state to history"""
-        tape_data = self.get_tape_snapshot()
-        self.history.append({
-            "step": self.state.steps,
-            "current_state": self.state.current_state,
-            "current_symbol": self.read_from_tape(),
-            "head_position": self.state.head_position,
-            "tape": tape_data["tape"],
-            "min_index": tape_data["min_index"],
-            "max_index": tape_data["max_index"]
-        })
+        if self.recorder is not None:
+            self.recorder(self)
+        if not self.keep_history:
+            return
+        min_index, max_index = self.get_tape_bounds()
+        tape_get = self.tape.get
+        blank = self.definition.blank
+        self.history.append(HistoryEntry(
+            self.state.steps,
+            self.state.current_state,
+            self.read_from_tape(),
+            self.state.head_position,
+            tuple([tape_get(i, blank) for i in range(min_index, max_index + 1)]),
+            min_index,
+            max_index,
+        ))
     
     def read_from_tape(self) -> str:
         """Read symbol at current head position"""
@@ -117,20 +160,11 @@ class TuringMachine:
             self.tape[self.state.head_position] = symbol
     
     def move_head(self, direction: MoveDirection):
-        if direction == MoveDirection.RIGHT:
-            self.state.head_position += 1
-        elif direction == MoveDirection.LEFT:
-            self.state.head_position -= 1
+        self.state.head_position += MOVE_DELTAS[direction]
     
     def find_transition(self) -> Optional[Transition]:
         """Find applicable transition for current state and head position"""
-        current_symbol = self.read_from_tape()
-        
-        for transition in self.definition.transitions:
-            if (transition.current_state == self.state.current_state and 
-                transition.read_symbol == current_symbol):
-                return transition
-        return None
+        return self.transition_table.get((self.state.current_state, self.read_from_tape()))
     
     def step(self) -> bool:
         """Execute one step and record history"""
@@ -147,7 +181,7 @@ class TuringMachine:
 
         # Apply transition
         self.write_to_tape(transition.write_symbol)
-        self.move_head(transition.move)
+        self.state.head_position += transition.delta
         self.state.current_state = transition.next_state
         self.state.steps += 1  # Step count increases
 
@@ -167,27 +201,20 @@ class TuringMachine:
                 break
         return self.state.halted
     
+    def get_tape_bounds(self) -> Tuple[int, int]:
+        """Return the (min, max) tape indices covering written cells and the head."""
+        if not self.tape:
+            return 0, 0
+        head = self.state.head_position
+        return min(min(self.tape), head), max(max(self.tape), head)
+
     def get_tape_snapshot(self) -> dict:
         """Get current tape as list with proper blank symbols and min/max indices."""
-        if not self.tape:
-            return {
-                "tape": [self.definition.blank],
-                "min_index": 0,
-                "max_index": 0
-            }
-        
-        min_index = min(self.tape.keys()) if self.tape else self.state.head_position
-        max_index = max(self.tape.keys()) if self.tape else self.state.head_position
-        
-        min_index = min(min_index, self.state.head_position)
-        max_index = max(max_index, self.state.head_position)
-        
-        tape_snapshot = []
-        for i in range(min_index, max_index + 1):
-            tape_snapshot.append(self.tape.get(i, self.definition.blank))
-        
+        min_index, max_index = self.get_tape_bounds()
+        tape_get = self.tape.get
+        blank = self.definition.blank
         return {
-            "tape": tape_snapshot,
+            "tape": [tape_get(i, blank) for i in range(min_index, max_index + 1)],
             "min_index": min_index,
             "max_index": max_index
-        }
\ No newline at end of file
+        }
@@ -1,12 +1,15 @@
 import os
 import logging
-from typing import Dict, List
-from flask import Blueprint, render_template, jsonify, request
+from typing import Dict, List, Optional
+from flask import Blueprint, current_app, render_template, jsonify, request
 import re
+import uuid
 from werkzeug.utils import secure_filename
 
-from .models import TuringMachine, MachineDefinition
-from .utils import parse_machine_file, create_machine_from_dict
+from .cache import RunCache
+from .models import HistoryEntry, TuringMachine, MachineDefinition
+from .trace import TraceReader, TraceWriter
+from .utils import load_machine_file
 
 # ------------------------
 # Blueprint
@@ -17,7 +20,15 @@ main_bp = Blueprint('routes', __name__)
 # Config & Globals
 # ------------------------
 MACHINES_DIR = "machines"
+TRACES_DIR = "traces"
+# Oldest trace files beyond this count are deleted when a new one is recorded
+TRACES_KEEP = 50
 machines: Dict[str, TuringMachine] = {}
+# Bumped on every change to a machine so clients applying step deltas can detect gaps
+versions: Dict[str, int] = {}
+# A step delta whose version is a multiple of N also carries the full state so
+# clients can correct drift
+KEYFRAME_INTERVAL = 50
 
 # ------------------------
 # Helper Functions
@@ -34,6 +45,46 @@ def serialize_machine_state(machine: TuringMachine) -> dict:
         "min_index": tape_data["min_index"],
         "max_index": tape_data["max_index"]
     }
+
+def serialize_step_delta(machine: TuringMachine, written_index: Optional[int], recorded: bool,
+                         base_version: int, version: int) -> dict:
+    """Return the changes made by a single step relative to base_version."""
+    min_index, max_index = machine.get_tape_bounds()
+    cell = None
+    if written_index is not None:
+        cell = {
+            "index": written_index,
+            "symbol": machine.tape.get(written_index, machine.definition.blank)
+        }
+    return {
+        "base_version": base_version,
+        "version": version,
+        "steps": machine.state.steps,  # same name as serialize_machine_state
+        "current_state": machine.state.current_state,
+        "halted": machine.state.halted,
+        "head_position": machine.state.head_position,
+        "cell": cell,
+        "recorded": recorded,  # whether the step added a history entry
+        "min_index": min_index,
+        "max_index": max_index
+    }
+
+def serialize_history_entry(entry: HistoryEntry) -> dict:
+    """Return JSON-serializable history entry; entries are stored as compact tuples."""
+    return {
+        "step": entry.step,
+        "current_state": entry.current_state,
+        "current_symbol": entry.current_symbol,
+        "head_position": entry.head_position,
+        "tape": list(entry.tape),
+        "min_index": entry.min_index,
+        "max_index": entry.max_index
+    }
+
+def serialize_history(machine: TuringMachine) -> List[dict]:
+    """Return JSON-serializable history of a machine."""
+    return [serialize_history_entry(entry) for entry in machine.history]
+
 def serialize_machine_info(definition: MachineDefinition) -> dict:
     """Return JSON-serializable machine definition with consistent field names."""
     return {
@@ -62,6 +113,47 @@ def get_machine(machine_id: str) -> TuringMachine:
         raise ValueError(f"Machine '{machine_id}' is not initialized")
     return machine
 
+def bump_version(machine_id: str) -> int:
+    """Record a change to the machine and return its new version."""
+    versions[machine_id] = versions.get(machine_id, 0) + 1
+    return versions[machine_id]
+
+def trace_path(trace_id: str) -> str:
+    """Return the file path of a recorded trace, rejecting unsafe ids."""
+    if not re.fullmatch(r"[\w-]+", trace_id or ""):
+        raise ValueError(f"Invalid trace id '{trace_id}'")
+    return os.path.join(TRACES_DIR, f"{trace_id}.trace")
+
+def prune_traces() -> None:
+    """Delete all but the TRACES_KEEP most recently recorded trace files."""
+    traces = []
+    for fname in os.listdir(TRACES_DIR):
+        if not fname.endswith(".trace"):
+            continue
+        path = os.path.join(TRACES_DIR, fname)
+        # Another request may prune the same files concurrently
+        try:
+            traces.append((os.path.getmtime(path), path))
+        except FileNotFoundError:
+            pass
+    traces.sort(reverse=True)
+    for _, path in traces[TRACES_KEEP:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def get_run_cache() -> RunCache:
+    """Return the application's run result cache, creating it on first use."""
+    cache = current_app.extensions.get("run_cache")
+    if cache is None:
+        cache = RunCache(
+            max_entries=current_app.config["RUN_CACHE_SIZE"],
+            path=current_app.config["RUN_CACHE_DB"],
+        )
+        current_app.extensions["run_cache"] = cache
+    return cache
+
 def error_response(message: str, code: int = 400):
     """Standard error JSON response."""
     return jsonify({"error": message}), code
@@ -106,8 +198,7 @@ def initialize_machine():
             return error_response("Machine definition not found", 404)
 
         # Parse definition and create TuringMachine
-        definition = parse_machine_file(path)
-        machine = create_machine_from_dict(definition)
+        machine = load_machine_file(path)
         machine.reset(list(tape_str))
         machines[machine_id] = machine
 
@@ -117,6 +208,7 @@ def initialize_machine():
         return jsonify({
             "status": "initialized",
             "machine_id": machine_id,
+            "version": bump_version(machine_id),
             "state": serialize_machine_state(machine),
             "machine_info": machine_info  # Use serialized info instead of raw definition
         })
@@ -138,6 +230,7 @@ def reset_machine():
         return jsonify({
             "status": "reset",
             "machine_id": machine_id,
+            "version": bump_version(machine_id),
             "state": serialize_machine_state(machine)
         })
 
@@ -151,19 +244,65 @@ def step_machine():
     try:
         data = request.get_json(force=True)
         machine_id = data.get("machine_id")
+        client_version = data.get("version")
 
         machine = get_machine(machine_id)
+        base_version = versions.get(machine_id, 0)
+        # step() writes at the current head position, if it writes at all
+        written_index = machine.state.head_position
+        history_length = len(machine.history)
         alive = machine.step()
-
-        return jsonify({
+        version = bump_version(machine_id)
+
+        if client_version != base_version:
+            # Client does not track versions or has missed an update: send everything
+            return jsonify({
+                "status": "stepped",
+                "alive": alive,
+                "version": version,
+                "state": serialize_machine_state(machine),
+                "history": serialize_history(machine)  # include full history
+            })
+
+        response = {
             "status": "stepped",
             "alive": alive,
+            "version": version,
+            "delta": serialize_step_delta(
+                machine,
+                written_index if alive else None,
+                len(machine.history) > history_length,
+                base_version,
+                version
+            )
+        }
+        if version % KEYFRAME_INTERVAL == 0:
+            response["state"] = serialize_machine_state(machine)
+        return jsonify(response)
+
+    except Exception as e:
+        logging.exception("Failed to step machine")
+        return error_response(str(e))
+
+
+@main_bp.route('/api/state', methods=['POST'])
+def machine_state():
+    """Return a full keyframe so a client can resync after missing a delta."""
+    try:
+        data = request.get_json(force=True)
+        machine_id = data.get("machine_id")
+
+        machine = get_machine(machine_id)
+
+        return jsonify({
+            "status": "state",
+            "version": versions.get(machine_id, 0),
             "state": serialize_machine_state(machine),
-            "history": machine.history  # include full history
+            "history": serialize_history(machine)
         })
 
     except Exception as e:
-        logging.exception("Failed to step machine")
+        logging.exception("Failed to fetch machine state")
         return error_response(str(e))
 
 
@@ -175,13 +314,14 @@ def run_machine():
         max_steps = int(data.get("max_steps", 1000))
 
         machine = get_machine(machine_id)
-        machine.run(max_steps)
+        get_run_cache().run(machine, max_steps)
 
         return jsonify({
             "status": "ran",
             "halted": machine.state.halted,
+            "version": bump_version(machine_id),
             "state": serialize_machine_state(machine),
-            "history": machine.history  # include full history
+            "history": serialize_history(machine)  # include full history
         })
 
     except ValueError:
@@ -190,6 +330,85 @@ def run_machine():
         logging.exception("Failed to run machine")
         return error_response(str(e))
     
+@main_bp.route('/api/trace', methods=['POST'])
+def record_trace():
+    """Run a machine while streaming its steps to a trace file instead of history."""
+    try:
+        data = request.get_json(force=True)
+        machine_id = data.get("machine_id")
+        try:
+            max_steps = int(data.get("max_steps", 1000))
+        except (TypeError, ValueError):
+            return error_response("max_steps must be an integer")
+
+        machine = get_machine(machine_id)
+        os.makedirs(TRACES_DIR, exist_ok=True)
+        # Machine ids may contain dots (EXAMPLE_9.2), which trace_path rejects
+        prefix = re.sub(r"[^\w-]", "_", machine_id)
+        trace_id = f"{prefix}-{uuid.uuid4().hex[:12]}"
+
+        # Traced steps are not added to the in-memory history
+        machine.keep_history = False
+        try:
+            with TraceWriter(trace_path(trace_id), machine) as trace:
+                machine.run(max_steps)
+        finally:
+            machine.keep_history = True
+        # The traced steps live in the trace file; restart the in-memory
+        # history from the current configuration so it has no silent gap
+        machine.history.clear()
+        machine.record_history()
+        prune_traces()
+
+        return jsonify({
+            "status": "traced",
+            "trace_id": trace_id,
+            "records": trace.records,
+            "halted": machine.state.halted,
+            "version": bump_version(machine_id),
+            "state": serialize_machine_state(machine),
+            "history": serialize_history(machine)
+        })
+
+    except Exception as e:
+        logging.exception("Failed to record trace")
+        return error_response(str(e))
+
+@main_bp.route('/api/trace/<trace_id>', methods=['GET'])
+def get_trace_page(trace_id):
+    """Return one page of a recorded trace as history entries."""
+    try:
+        page = int(request.args.get("page", 0))
+        page_size = min(int(request.args.get("page_size", 100)), 1000)
+        if page < 0 or page_size < 1:
+            return error_response("page must be >= 0 and page_size >= 1")
+
+        path = trace_path(trace_id)
+        if not os.path.exists(path):
+            return error_response("Trace not found", 404)
+
+        with TraceReader(path) as reader:
+            entries = reader.page(page, page_size)
+            records = len(reader)
+
+        return jsonify({
+            "trace_id": trace_id,
+            "records": records,
+            "page": page,
+            "page_size": page_size,
+            "pages": (records + page_size - 1) // page_size,
+            "history": [serialize_history_entry(entry) for entry in entries]
+        })
+
+    except Exception as e:
+        logging.exception("Failed to read trace")
+        return error_response(str(e))
+
+@main_bp.route('/api/cache', methods=['GET'])
+def run_cache_stats():
+    """Return hit/miss counts of the run result cache."""
+    return jsonify(get_run_cache().stats())
+
 @main_bp.route('/api/machines/create', methods=['POST'])
 def create_machine():
     """Create a new machine definition from form data."""
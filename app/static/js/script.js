@@ -1,5 +1,7 @@
 const TMSimulator = (() => {
   let machineId = null;
+  let machineVersion = null; // last server version applied to the view
+  let blankSymbol = "";
   let runInterval = null;
   const simulationSpeed = 300; // ms per step
 
@@ -24,6 +26,8 @@ const TMSimulator = (() => {
       { tape: initialTape, machine: machineName },
       (response) => {
         machineId = response.machine_id;
+        machineVersion = response.version;
+        blankSymbol = response.machine_info.blank;
         updateMachineState(response.state);
         updateMachineInfo(response.machine_info);
         toggleControls(true);
@@ -41,6 +45,7 @@ const TMSimulator = (() => {
       "/api/reset",
       { machine_id: machineId, tape: tapeStr },
       (response) => {
+        machineVersion = response.version;
         updateMachineState(response.state);
         updateStatus("Machine reset");
       },
@@ -51,14 +56,51 @@ const TMSimulator = (() => {
   function handleStep() {
     if (!machineId) return;
 
+    requestStep(
+      (halted) => {
+        if (halted) updateStatus("Computation halted");
+      },
+      (xhr) => updateStatus("Error stepping machine: " + xhr.responseText)
+    );
+  }
+
+  // Step the machine, applying the returned delta when it follows on from
+  // the version we have; anything else is a gap and triggers a resync.
+  function requestStep(done, fail) {
     $.postJSON(
       "/api/step",
+      { machine_id: machineId, version: machineVersion },
+      (response) => {
+        if (response.version <= machineVersion) return; // stale, out of order
+
+        const delta = response.delta;
+        if (!delta) {
+          // Server sent a full keyframe
+          machineVersion = response.version;
+          updateMachineState(response.state, response.history);
+          return done(response.state.halted);
+        }
+        if (delta.base_version !== machineVersion) return resync(done, fail);
+
+        machineVersion = delta.version;
+        applyStepDelta(delta, blankSymbol);
+        if (response.state) renderTape(response.state); // periodic keyframe
+        done(delta.halted);
+      },
+      fail
+    );
+  }
+
+  function resync(done, fail) {
+    $.postJSON(
+      "/api/state",
       { machine_id: machineId },
       (response) => {
+        machineVersion = response.version;
         updateMachineState(response.state, response.history);
-        if (response.state.halted) updateStatus("Computation halted");
+        done(response.state.halted);
       },
-      (xhr) => updateStatus("Error stepping machine: " + xhr.responseText)
+      fail
     );
   }
 
@@ -85,6 +127,7 @@ const TMSimulator = (() => {
       "/api/run",
       { machine_id: machineId, max_steps: 1000 },
       (response) => {
+        machineVersion = response.version;
         updateMachineState(response.state, response.history);
         updateStatus(
           response.state.halted
@@ -115,12 +158,9 @@ const TMSimulator = (() => {
     runInterval = setInterval(() => {
       if (!machineId) return stopRun();
 
-      $.postJSON(
-        "/api/step",
-        { machine_id: machineId },
-        (response) => {
-          updateMachineState(response.state, response.history);
-          if (response.state.halted) {
+      requestStep(
+        (halted) => {
+          if (halted) {
             stopRun();
             updateStatus("Computation halted");
           }
@@ -166,78 +206,158 @@ function updateStatus(message) {
   $("#statusInfo").text(message);
 }
 
+// Rendered tape: symbols and DOM cells keyed by tape position, so a step
+// delta only touches the cells it changes.
+const tapeView = { minIndex: 0, maxIndex: -1, head: null, symbols: {}, cells: {} };
+
 function updateMachineState(state, history = []) {
+  updateCounters(state);
+  renderTape(state);
+  updateHistoryTable(history);
+}
+
+function updateCounters(state) {
   // === Update current state and step count ===
   $("#currentState").text(state.current_state || "-");
   $("#stepCount").text(state.steps || 0);
 
-  // === Update tape visualization ===
-  const $tapeContainer = $("#tapeContainer").empty();
-  if (state.tape && state.tape.length > 0) {
-    state.tape.forEach((symbol, index) => {
-      const position = (state.min_index || 0) + index;
-      const isHead = position === (state.head_position || 0);
-
-      const $cell = $("<div>")
-        .addClass("tape-cell")
-        .toggleClass("cell-head", isHead)
-        .text(symbol);
-
-      $cell.append($("<div>").addClass("cell-index").text(position));
-      if (isHead)
-        $cell.append($("<div>").addClass("head-indicator").text("HEAD"));
+  // === Update computation status ===
+  if (state.halted) {
+    $("#statusInfo").html(
+      `<span class="badge bg-success">HALTED</span> Computation completed after ${state.steps} steps`
+    );
+  }
+}
 
-      $tapeContainer.append($cell);
-    });
+function renderTape(state) {
+  const $tapeContainer = $("#tapeContainer").empty();
+  Object.assign(tapeView, { minIndex: 0, maxIndex: -1, head: null, symbols: {}, cells: {} });
 
-    // Auto-scroll so head is centered
-    const $headCell = $tapeContainer.find(".cell-head");
-    if ($headCell.length) {
-      const containerWidth = $tapeContainer.width();
-      const headOffset = $headCell.position().left + $headCell.outerWidth() / 2;
-      $tapeContainer.animate(
-        { scrollLeft: headOffset - containerWidth / 2 },
-        200
-      );
-    }
-  } else {
+  if (!state.tape || state.tape.length === 0) {
     $tapeContainer.append(
       $("<div>").addClass("text-center text-muted").text("Tape is empty")
     );
+    return;
   }
 
-  // === Update computation status ===
-  if (state.halted) {
-    $("#statusInfo").html(
-      `<span class="badge bg-success">HALTED</span> Computation completed after ${state.steps} steps`
-    );
-  }
+  tapeView.minIndex = state.min_index || 0;
+  tapeView.maxIndex = tapeView.minIndex + state.tape.length - 1;
+  state.tape.forEach((symbol, index) => {
+    const position = tapeView.minIndex + index;
+    tapeView.symbols[position] = symbol;
+    tapeView.cells[position] = createTapeCell(position, symbol);
+    $tapeContainer.append(tapeView.cells[position]);
+  });
+  moveHead(state.head_position || 0);
+}
 
-  // === Update history table ===
-  updateHistoryTable(history);
+function createTapeCell(position, symbol) {
+  const $cell = $("<div>").addClass("tape-cell").text(symbol);
+  $cell.append($("<div>").addClass("cell-index").text(position));
+  return $cell;
+}
+
+function setTapeSymbol(position, symbol) {
+  tapeView.symbols[position] = symbol;
+  // The symbol is the cell's leading text node, before the index/head children
+  tapeView.cells[position].contents().first()[0].nodeValue = symbol;
+}
+
+function moveHead(position) {
+  const $old = tapeView.cells[tapeView.head];
+  if ($old) $old.removeClass("cell-head").find(".head-indicator").remove();
+
+  tapeView.head = position;
+  const $headCell = tapeView.cells[position];
+  if (!$headCell) return;
+  $headCell
+    .addClass("cell-head")
+    .append($("<div>").addClass("head-indicator").text("HEAD"));
+
+  // Auto-scroll so head is centered
+  const $tapeContainer = $("#tapeContainer");
+  const containerWidth = $tapeContainer.width();
+  const headOffset = $headCell.position().left + $headCell.outerWidth() / 2;
+  $tapeContainer.stop().animate(
+    { scrollLeft: headOffset - containerWidth / 2 },
+    200
+  );
+}
+
+function applyStepDelta(delta, blank) {
+  const $tapeContainer = $("#tapeContainer");
+  const oldMin = tapeView.minIndex;
+  const oldMax = tapeView.maxIndex;
+  const newMin = delta.min_index;
+  const newMax = delta.max_index;
+
+  // Drop cells that fell outside the tape extent; they are blank
+  const dropCell = (p) => {
+    tapeView.cells[p].remove();
+    delete tapeView.cells[p];
+    delete tapeView.symbols[p];
+  };
+  for (let p = oldMin; p <= Math.min(newMin - 1, oldMax); p++) dropCell(p);
+  for (let p = Math.max(newMax + 1, oldMin); p <= oldMax; p++) dropCell(p);
+
+  // Add blank cells for newly covered positions
+  const addCell = (p, attach) => {
+    if (tapeView.cells[p]) return;
+    tapeView.symbols[p] = blank;
+    tapeView.cells[p] = createTapeCell(p, blank);
+    attach(tapeView.cells[p]);
+  };
+  for (let p = Math.min(oldMin - 1, newMax); p >= newMin; p--)
+    addCell(p, ($cell) => $tapeContainer.prepend($cell));
+  for (let p = Math.max(oldMax + 1, newMin); p <= newMax; p++)
+    addCell(p, ($cell) => $tapeContainer.append($cell));
+
+  tapeView.minIndex = newMin;
+  tapeView.maxIndex = newMax;
+
+  if (delta.cell && tapeView.cells[delta.cell.index])
+    setTapeSymbol(delta.cell.index, delta.cell.symbol);
+  moveHead(delta.head_position);
+  updateCounters(delta);
+
+  // History rows are rebuilt from the reconstructed tape
+  if (!delta.recorded) return;
+  const tape = [];
+  for (let p = newMin; p <= newMax; p++) tape.push(tapeView.symbols[p]);
+  appendHistoryRow({
+    step: delta.steps,
+    current_state: delta.current_state,
+    current_symbol: tapeView.symbols[delta.head_position] ?? blank,
+    tape,
+    head_position: delta.head_position,
+  });
 }
 
 function updateHistoryTable(history = []) {
   const $tbody = $("#historyTable").empty();
   if (history && history.length > 0) {
-    history.forEach((step) => {
-      const tapeStr = step.tape ? step.tape.join(" ") : "";
-      const row = `
-        <tr>
-          <td>${step.step}</td>
-          <td>${step.current_state}</td>
-          <td>${step.current_symbol}</td>
-          <td>${tapeStr}</td>
-          <td>${step.head_position}</td>
-        </tr>
-      `;
-      $tbody.append(row);
-    });
+    history.forEach(appendHistoryRow);
   } else {
-    $tbody.append('<tr><td colspan="5" class="text-center text-muted">No history yet</td></tr>');
+    $tbody.append('<tr class="history-empty"><td colspan="5" class="text-center text-muted">No history yet</td></tr>');
   }
 }
 
+function appendHistoryRow(step) {
+  const $tbody = $("#historyTable");
+  $tbody.find(".history-empty").remove();
+  const tapeStr = step.tape ? step.tape.join(" ") : "";
+  const row = `
+    <tr>
+      <td>${step.step}</td>
+      <td>${step.current_state}</td>
+      <td>${step.current_symbol}</td>
+      <td>${tapeStr}</td>
+      <td>${step.head_position}</td>
+    </tr>
+  `;
+  $tbody.append(row);
+}
+
 function updateMachineInfo(info) {
   $("#statesInfo").text(info.states?.length ? info.states.join(", ") : "-");
   $("#inputAlphabet").text(
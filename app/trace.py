@@ -0,0 +1,286 @@
+"""
+Compressed on-disk traces of long executions.
+
+A TraceWriter attached to a TuringMachine streams every recorded step to a
+file while run() executes, so the history does not have to be kept in
+memory. Steps are buffered into chunks that are compressed independently;
+each chunk starts with a keyframe of the whole tape followed by one small
+record per step (head, state and the cell written). A seek index at the end
+of the file maps record numbers to chunks, so a TraceReader can rebuild any
+step by decompressing a single chunk of the memory-mapped file.
+
+File layout:
+    MAGIC, u32 header length, header JSON (codec, states, symbols, blank)
+    compressed chunks
+    index: u64 first record, u64 offset, u32 length per chunk
+    footer: u64 index offset, u32 chunk count, u64 record count, MAGIC
+"""
+import bisect
+import json
+import lzma
+import mmap
+import struct
+import zlib
+from typing import Dict, Iterator, List, Optional
+
+from .models import HistoryEntry, MachineState, TuringMachine
+
+MAGIC = b"TMTRACE1"
+
+_U32 = struct.Struct("<I")
+_CELL = struct.Struct("<qI")  # tape index, symbol id
+_RECORD = struct.Struct("<qqIqIB")  # step, head, state id, written index, written symbol id, flags
+_INDEX = struct.Struct("<QQI")
+_FOOTER = struct.Struct("<QIQ8s")
+
+# Record flags
+_HALTED = 1
+_WROTE = 2
+
+CODECS = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+
+class TraceWriter:
+    """
+    Record a machine's steps to a trace file.
+
+    The current configuration is written as the first record, then every
+    step recorded by the machine until close(). Use as a context manager:
+
+        with TraceWriter(path, machine):
+            machine.run(max_steps)
+    """
+
+    def __init__(self, path: str, machine: TuringMachine, chunk_size: int = 4096, codec: str = "zlib"):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown trace codec '{codec}'")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+
+        definition = machine.definition
+        states = sorted(definition.states)
+        symbols = sorted(definition.tape_alphabet)
+        self.machine = machine
+        self.chunk_size = chunk_size
+        self.records = 0
+        self._compress = CODECS[codec][0]
+        self._state_ids = {state: i for i, state in enumerate(states)}
+        self._symbol_ids = {symbol: i for i, symbol in enumerate(symbols)}
+        self._blank = definition.blank
+        self._index: List[tuple] = []
+        self._chunk = bytearray()
+        self._chunk_records = 0
+        self._chunk_first = 0
+        self._chunk_limit = chunk_size
+        # Last recorded configuration, to derive the cell written by a step
+        self._last_state: Optional[MachineState] = None
+        self._last_steps = 0
+        self._last_head = 0
+
+        header = json.dumps({
+            "codec": codec,
+            "chunk_size": chunk_size,
+            "states": states,
+            "symbols": symbols,
+            "blank": definition.blank,
+        }, ensure_ascii=False).encode("utf-8")
+        self._file = open(path, "wb")
+        self._file.write(MAGIC + _U32.pack(len(header)) + header)
+
+        self.record(machine)
+        machine.recorder = self.record
+
+    def record(self, machine: TuringMachine) -> None:
+        """Append the machine's current configuration to the trace."""
+        state = machine.state
+        flags = _HALTED if state.halted else 0
+        written_index = written_symbol = 0
+
+        # A reset or restored machine gets a new MachineState: start a keyframe
+        continuous = state is self._last_state and state.steps - self._last_steps in (0, 1)
+        if self._chunk_records and not continuous:
+            self._flush()
+        if not self._chunk_records:
+            self._start_chunk(machine)
+        elif state.steps != self._last_steps:
+            # step() writes at the head position before moving it
+            flags |= _WROTE
+            written_index = self._last_head
+            written_symbol = self._symbol_ids[machine.tape.get(written_index, self._blank)]
+
+        self._chunk += _RECORD.pack(
+            state.steps, state.head_position, self._state_ids[state.current_state],
+            written_index, written_symbol, flags
+        )
+        self._chunk_records += 1
+        self.records += 1
+        self._last_state = state
+        self._last_steps = state.steps
+        self._last_head = state.head_position
+        if self._chunk_records >= self._chunk_limit:
+            self._flush()
+
+    def close(self) -> None:
+        """Write the remaining steps, the seek index and the footer."""
+        if self._file.closed:
+            return
+        if self.machine.recorder == self.record:
+            self.machine.recorder = None
+        self._flush()
+        index_offset = self._file.tell()
+        for entry in self._index:
+            self._file.write(_INDEX.pack(*entry))
+        self._file.write(_FOOTER.pack(index_offset, len(self._index), self.records, MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start_chunk(self, machine: TuringMachine) -> None:
+        self._chunk = bytearray(_U32.pack(len(machine.tape)))
+        for index, symbol in machine.tape.items():
+            self._chunk += _CELL.pack(index, self._symbol_ids[symbol])
+        self._chunk_first = self.records
+        # Wide tapes get longer chunks so keyframes stay at most one cell per step
+        self._chunk_limit = max(self.chunk_size, len(machine.tape))
+
+    def _flush(self) -> None:
+        if not self._chunk_records:
+            return
+        data = self._compress(bytes(self._chunk))
+        self._index.append((self._chunk_first, self._file.tell(), len(data)))
+        self._file.write(data)
+        self._chunk = bytearray()
+        self._chunk_records = 0
+
+
+class TraceReader:
+    """Random access to the records of a trace file as HistoryEntry tuples."""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Trace file '{path}' is empty")
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a trace file")
+        if len(self._map) < len(MAGIC) + _U32.size + _FOOTER.size:
+            self.close()
+            raise ValueError(f"Trace file '{path}' is incomplete")
+        index_offset, chunks, records, magic = _FOOTER.unpack_from(self._map, len(self._map) - _FOOTER.size)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Trace file '{path}' is incomplete")
+
+        self.path = path
+        try:
+            (header_length,) = _U32.unpack_from(self._map, len(MAGIC))
+            start = len(MAGIC) + _U32.size
+            self.header = json.loads(self._map[start:start + header_length].decode("utf-8"))
+            self._decompress = CODECS[self.header["codec"]][1]
+            self._states = self.header["states"]
+            self._symbols = self.header["symbols"]
+            self._blank = self.header["blank"]
+            self._index = [
+                _INDEX.unpack_from(self._map, index_offset + i * _INDEX.size) for i in range(chunks)
+            ]
+        except (KeyError, TypeError, ValueError, struct.error):
+            self.close()
+            raise ValueError(f"'{path}' is not a valid trace file")
+        self._records = records
+        self._firsts = [first for first, _, _ in self._index]
+        # Most recently decoded chunk: (chunk number, keyframe tape, records)
+        self._decoded = (None, None, None)
+
+    def __len__(self) -> int:
+        return self._records
+
+    def __getitem__(self, position: int) -> HistoryEntry:
+        if position < 0:
+            position += self._records
+        if not 0 <= position < self._records:
+            raise IndexError("trace record out of range")
+        return next(self.entries(position, position + 1))
+
+    def page(self, page: int, page_size: int) -> List[HistoryEntry]:
+        """Return records [page * page_size, (page + 1) * page_size)."""
+        start = page * page_size
+        return list(self.entries(start, start + page_size))
+
+    def entries(self, start: int = 0, stop: Optional[int] = None) -> Iterator[HistoryEntry]:
+        """Yield records start..stop-1, decompressing only the chunks they span."""
+        stop = self._records if stop is None else min(stop, self._records)
+        position = max(start, 0)
+        while position < stop:
+            chunk = bisect.bisect_right(self._firsts, position) - 1
+            keyframe, records = self._chunk(chunk)
+            tape = dict(keyframe)
+            number = self._firsts[chunk]
+            for step, head, state_id, written_index, symbol_id, flags in _RECORD.iter_unpack(records):
+                if flags & _WROTE:
+                    symbol = self._symbols[symbol_id]
+                    if symbol == self._blank:
+                        tape.pop(written_index, None)
+                    else:
+                        tape[written_index] = symbol
+                if number >= position:
+                    yield self._entry(tape, step, head, self._states[state_id])
+                    position += 1
+                    if position >= stop:
+                        return
+                number += 1
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _chunk(self, chunk: int):
+        if self._decoded[0] != chunk:
+            _, offset, length = self._index[chunk]
+            try:
+                data = self._decompress(self._map[offset:offset + length])
+                (cells,) = _U32.unpack_from(data, 0)
+                keyframe: Dict[int, str] = {}
+                for i in range(cells):
+                    index, symbol_id = _CELL.unpack_from(data, _U32.size + i * _CELL.size)
+                    keyframe[index] = self._symbols[symbol_id]
+            except (zlib.error, lzma.LZMAError, struct.error, IndexError):
+                raise ValueError(f"'{self.path}' is not a valid trace file")
+            records = memoryview(data)[_U32.size + cells * _CELL.size:]
+            self._decoded = (chunk, keyframe, records)
+        return self._decoded[1], self._decoded[2]
+
+    def _entry(self, tape: Dict[int, str], step: int, head: int, state: str) -> HistoryEntry:
+        # Same bounds as TuringMachine.get_tape_bounds
+        if tape:
+            min_index, max_index = min(min(tape), head), max(max(tape), head)
+        else:
+            min_index = max_index = 0
+        blank = self._blank
+        return HistoryEntry(
+            step,
+            state,
+            tape.get(head, blank),
+            head,
+            tuple([tape.get(i, blank) for i in range(min_index, max_index + 1)]),
+            min_index,
+            max_index,
+        )
@@ -1,5 +1,5 @@
+import sys
 from typing import Dict, Any, List
-from app import models
 from .models import TuringMachine, MachineDefinition, Transition, MoveDirection
 
 def create_machine_from_dict(definition_dict: Dict[str, Any]) -> TuringMachine:
@@ -88,3 +88,102 @@ def parse_machine_file(path: str) -> Dict[str, Any]:
                 })
 
     return definition
+
+
+_LIST_HEADERS = ("states", "input_alphabet", "tape_alphabet", "final_states")
+_SCALAR_HEADERS = ("blank", "initial_state")
+_MOVES = {direction.value: direction for direction in MoveDirection}
+
+
+def parse_machine_definition(path: str) -> MachineDefinition:
+    """
+    Parse a machine definition file straight into a MachineDefinition.
+
+    Unlike parse_machine_file, transitions are built as interned Transition
+    objects and inserted into the (current_state, read_symbol) lookup table
+    while the file is read, so no intermediate dictionaries are kept.
+    Each transition is validated as soon as the header lines it depends on
+    have been seen; errors report the offending line number.
+    """
+    sections: Dict[str, Any] = {}
+    transitions: List[Transition] = []
+    table: Dict[tuple, Transition] = {}
+    # Transitions that appeared before the states/tape_alphabet headers
+    pending: List[tuple] = []
+    intern = sys.intern
+
+    def fail(lineno: int, message: str):
+        raise ValueError(f"{path}, line {lineno}: {message}")
+
+    def check(lineno: int, t: Transition):
+        states = sections["states"]
+        tape_alphabet = sections["tape_alphabet"]
+        if t.current_state not in states:
+            fail(lineno, f"Transition state '{t.current_state}' not in states")
+        if t.read_symbol not in tape_alphabet:
+            fail(lineno, f"Read symbol '{t.read_symbol}' not in tape alphabet")
+        if t.next_state not in states:
+            fail(lineno, f"Next state '{t.next_state}' not in states")
+        if t.write_symbol not in tape_alphabet:
+            fail(lineno, f"Write symbol '{t.write_symbol}' not in tape alphabet")
+
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#") or line == "transitions:":
+                continue
+
+            if "->" in line:
+                try:
+                    left, right = line.split("->")
+                    current_state, read_symbol = [intern(x.strip()) for x in left.split(",")]
+                    next_state, write_symbol, move = [x.strip() for x in right.split(",")]
+                    next_state, write_symbol = intern(next_state), intern(write_symbol)
+                except ValueError:
+                    fail(lineno, f"Malformed transition line: {line}")
+                direction = _MOVES.get(move)
+                if direction is None:
+                    fail(lineno, f"Invalid move direction '{move}'")
+
+                transition = Transition(current_state, read_symbol, next_state, write_symbol, direction)
+                if "states" in sections and "tape_alphabet" in sections:
+                    check(lineno, transition)
+                else:
+                    pending.append((lineno, transition))
+                # First matching transition wins, as in TuringMachine
+                table.setdefault((current_state, read_symbol), transition)
+                transitions.append(transition)
+                continue
+
+            name, sep, value = line.partition(":")
+            name = name.strip()
+            if not sep or name not in _LIST_HEADERS + _SCALAR_HEADERS:
+                fail(lineno, f"Unrecognized line: {line}")
+            if name in sections:
+                fail(lineno, f"Duplicate '{name}' declaration")
+            if name in _LIST_HEADERS:
+                sections[name] = {intern(s.strip()) for s in value.split(",") if s.strip()}
+            else:
+                sections[name] = intern(value.strip())
+
+    for name in _LIST_HEADERS + _SCALAR_HEADERS:
+        if name not in sections:
+            raise ValueError(f"{path}: Missing '{name}' declaration")
+    for lineno, transition in pending:
+        check(lineno, transition)
+
+    return MachineDefinition(
+        states=sections["states"],
+        input_alphabet=sections["input_alphabet"],
+        tape_alphabet=sections["tape_alphabet"],
+        transitions=transitions,
+        blank=sections["blank"],
+        initial_state=sections["initial_state"],
+        final_states=sections["final_states"],
+        transition_table=table,
+    )
+
+
+def load_machine_file(path: str) -> TuringMachine:
+    """Parse a machine definition file and return a ready TuringMachine."""
+    return TuringMachine(definition=parse_machine_definition(path))
@@ -0,0 +1,82 @@
+"""
+Benchmark memory used per transition and per history entry.
+
+"before" rebuilds the previous representation (a plain dataclass per
+transition, a 7-key dict with a list tape per history entry) so both
+layouts are measured on the same data.
+
+Usage:
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py 200000
+"""
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import MoveDirection, Transition, HistoryEntry  # noqa: E402
+
+# Short tape shared by every history entry, as on a simple machine
+TAPE = ["0", "1", "1", "0", "1", "_", "_", "0"]
+
+
+@dataclass
+class LegacyTransition:
+    current_state: str
+    read_symbol: str
+    next_state: str
+    write_symbol: str
+    move: MoveDirection
+
+
+def bytes_per_item(build, n: int) -> float:
+    tracemalloc.start()
+    items = build(n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current / n
+
+
+def legacy_history(n: int):
+    return [
+        {
+            "step": i,
+            "current_state": "q0",
+            "current_symbol": "1",
+            "head_position": i % len(TAPE),
+            "tape": [s for s in TAPE],
+            "min_index": 0,
+            "max_index": len(TAPE) - 1,
+        }
+        for i in range(n)
+    ]
+
+
+def compact_history(n: int):
+    return [
+        HistoryEntry(i, "q0", "1", i % len(TAPE), tuple([s for s in TAPE]), 0, len(TAPE) - 1)
+        for i in range(n)
+    ]
+
+
+def main(argv) -> None:
+    n = int(argv[0]) if argv else 100000
+    states = [f"q{i}" for i in range(n)]
+
+    def build_transitions(cls):
+        return lambda count: [cls(states[i], "0", states[i], "1", MoveDirection.RIGHT) for i in range(count)]
+
+    rows = [
+        ("transition", build_transitions(LegacyTransition), build_transitions(Transition)),
+        (f"history entry ({len(TAPE)}-cell tape)", legacy_history, compact_history),
+    ]
+    print(f"{'':<32}{'before':>10}{'after':>10}   bytes/item, n={n}")
+    for label, before, after in rows:
+        print(f"{label:<32}{bytes_per_item(before, n):>10.0f}{bytes_per_item(after, n):>10.0f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,70 @@
+"""
+Benchmark loading large generated machine definition files.
+
+Compares the dictionary based loader (parse_machine_file followed by
+create_machine_from_dict) with the streaming parse_machine_definition.
+
+Usage:
+    python benchmarks/bench_parser.py              # 10^5 and 10^6 transitions
+    python benchmarks/bench_parser.py 200000
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import TuringMachine  # noqa: E402
+from app.utils import parse_machine_file, create_machine_from_dict, parse_machine_definition  # noqa: E402
+
+SYMBOLS = ["0", "1", "a", "_"]
+
+
+def write_synthetic_machine(path: str, transitions: int) -> None:
+    """Write a machine with len(SYMBOLS) transitions per state."""
+    n_states = transitions // len(SYMBOLS)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"states: {','.join(f'q{i}' for i in range(n_states + 1))}\n")
+        f.write("input_alphabet: 0,1\n")
+        f.write(f"tape_alphabet: {','.join(SYMBOLS)}\n")
+        f.write("blank: _\n")
+        f.write("initial_state: q0\n")
+        f.write(f"final_states: q{n_states}\n")
+        f.write("transitions:\n")
+        for i in range(n_states):
+            for j, symbol in enumerate(SYMBOLS):
+                move = "R" if j % 2 else "L"
+                f.write(f"q{i},{symbol} -> q{i + 1},{SYMBOLS[-1 - j]},{move}\n")
+
+
+def measure(label: str, load) -> None:
+    # Time and memory are measured in separate loads; tracemalloc slows
+    # allocation-heavy code down by an order of magnitude.
+    start = time.perf_counter()
+    machine = load()
+    elapsed = time.perf_counter() - start
+    del machine
+
+    tracemalloc.start()
+    machine = load()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<10} {elapsed:8.2f} s   final {current / 2**20:8.1f} MiB   peak {peak / 2**20:8.1f} MiB")
+    del machine
+
+
+def main(argv) -> None:
+    sizes = [int(a) for a in argv] or [10**5, 10**6]
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f"machine_{size}.txt")
+            write_synthetic_machine(path, size)
+            print(f"{size} transitions ({os.path.getsize(path) / 2**20:.1f} MiB file)")
+            measure("dict", lambda: create_machine_from_dict(parse_machine_file(path)))
+            measure("streaming", lambda: TuringMachine(definition=parse_machine_definition(path)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
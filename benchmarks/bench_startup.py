@@ -0,0 +1,58 @@
+"""
+Benchmark cold start of the command line runner.
+
+Reports the cumulative import time of app.cli (from ``python -X importtime``)
+and the wall-clock time of a whole ``python -m app run`` against a bare
+interpreter start. Each figure is the best of several runs.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py 20
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Target for importing app.cli (and so for starting a pool worker); the
+# test suite checks the same figure with headroom for slow CI machines
+CLI_IMPORT_TARGET_MS = 50
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of module in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    for line in result.stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        if name == module:
+            return int(cumulative) / 1000
+    raise RuntimeError(f"{module} not found in -X importtime output")
+
+
+def wall_time_ms(args) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=ROOT, capture_output=True, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main(argv) -> None:
+    runs = int(argv[0]) if argv else 10
+    cli_import = min(import_time_ms("app.cli") for _ in range(runs))
+    bare = min(wall_time_ms(["-c", "pass"]) for _ in range(runs))
+    cli_run = min(wall_time_ms(["-m", "app", "run", "binary_incrementer", "1011"]) for _ in range(runs))
+    web_import = min(import_time_ms("flask") for _ in range(runs))
+
+    status = "ok" if cli_import <= CLI_IMPORT_TARGET_MS else "OVER TARGET"
+    print(f"import app.cli        {cli_import:8.1f} ms   (target {CLI_IMPORT_TARGET_MS} ms: {status})")
+    print(f"import flask          {web_import:8.1f} ms   (avoided by the CLI)")
+    print(f"python -c pass        {bare:8.1f} ms")
+    print(f"python -m app run     {cli_run:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
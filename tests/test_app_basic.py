@@ -1,3 +1,167 @@
+import os
+
+
 def test_index_route_exists(client):
     res = client.get("/")
-    assert res is not None
\ No newline at end of file
+    assert res is not None
+
+def test_step_returns_history(client):
+    """Test that stepping returns history entries as JSON objects."""
+    res = client.post("/api/init", json={"machine": "binary_incrementer", "tape": "1"})
+    machine_id = res.get_json()["machine_id"]
+
+    res = client.post("/api/step", json={"machine_id": machine_id})
+    data = res.get_json()
+    assert data["state"]["steps"] == 1
+    assert data["history"][-1] == {
+        "step": 1,
+        "current_state": "q0",
+        "current_symbol": "□",
+        "head_position": 1,
+        "tape": ["1", "□"],
+        "min_index": 0,
+        "max_index": 1,
+    }
+
+
+def apply_delta(tape, delta, blank):
+    """Reconstruct the tape the way the visualizer does from a step delta."""
+    tape = {p: s for p, s in tape.items() if delta["min_index"] <= p <= delta["max_index"]}
+    for p in range(delta["min_index"], delta["max_index"] + 1):
+        tape.setdefault(p, blank)
+    if delta["cell"] and delta["cell"]["index"] in tape:
+        tape[delta["cell"]["index"]] = delta["cell"]["symbol"]
+    return tape
+
+
+def test_step_deltas_reconstruct_tape(client):
+    """Test that applying step deltas in order reproduces the server tape."""
+    res = client.post("/api/init", json={"machine": "binary_incrementer", "tape": "1011"})
+    data = res.get_json()
+    machine_id, version = data["machine_id"], data["version"]
+    state = data["state"]
+    tape = {state["min_index"] + i: s for i, s in enumerate(state["tape"])}
+
+    halted = False
+    steps = 0
+    while not halted:
+        data = client.post("/api/step", json={"machine_id": machine_id, "version": version}).get_json()
+        delta = data["delta"]
+        assert "history" not in data
+        steps += 1
+        assert delta["steps"] == steps
+        assert delta["base_version"] == version
+        version = delta["version"]
+        tape = apply_delta(tape, delta, "□")
+        halted = delta["halted"]
+
+    full = client.post("/api/state", json={"machine_id": machine_id}).get_json()
+    assert full["version"] == version
+    state = full["state"]
+    # The visualizer feeds deltas to the same counter code as full states
+    for field in ("steps", "current_state", "halted", "head_position"):
+        assert delta[field] == state[field]
+    assert [tape[p] for p in sorted(tape)] == state["tape"]
+    assert min(tape) == state["min_index"]
+
+
+def test_step_with_stale_version_resyncs(client):
+    """Test that a client with a missed update gets a full keyframe."""
+    res = client.post("/api/init", json={"machine": "binary_incrementer", "tape": "1"})
+    data = res.get_json()
+    machine_id, version = data["machine_id"], data["version"]
+
+    client.post("/api/step", json={"machine_id": machine_id, "version": version})
+    data = client.post("/api/step", json={"machine_id": machine_id, "version": version}).get_json()
+    assert "delta" not in data
+    assert data["version"] == version + 2
+    assert data["state"]["steps"] == 2
+    assert len(data["history"]) == 3
+
+
+def test_run_uses_result_cache(client):
+    """Test that repeated runs are counted as cache hits."""
+    for _ in range(2):
+        res = client.post("/api/init", json={"machine": "even_odd_checker", "tape": "1111"})
+        machine_id = res.get_json()["machine_id"]
+        data = client.post("/api/run", json={"machine_id": machine_id, "max_steps": 500}).get_json()
+
+    stats = client.get("/api/cache").get_json()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert data["history"][0]["step"] == 0
+
+
+def test_record_and_browse_trace(client, tmp_path, monkeypatch):
+    """Test recording a trace and reading it back page by page."""
+    from app import routes
+    monkeypatch.setattr(routes, "TRACES_DIR", str(tmp_path))
+
+    res = client.post("/api/init", json={"machine": "binary_incrementer", "tape": "1011"})
+    machine_id = res.get_json()["machine_id"]
+    data = client.post("/api/trace", json={"machine_id": machine_id, "max_steps": 100}).get_json()
+    assert data["halted"] is True
+    assert data["records"] == 11
+
+    # In-memory history restarts at the end of the traced run
+    state = client.post("/api/state", json={"machine_id": machine_id}).get_json()
+    assert [entry["step"] for entry in state["history"]] == [state["state"]["steps"]] == [10]
+
+    page = client.get(f"/api/trace/{data['trace_id']}?page=1&page_size=4").get_json()
+    assert page["pages"] == 3
+    assert [entry["step"] for entry in page["history"]] == [4, 5, 6, 7]
+
+    assert client.get("/api/trace/missing").status_code == 404
+    assert client.get("/api/trace/..%2Fsecret").status_code in (400, 404)
+
+
+def test_trace_machine_id_with_dot(client, tmp_path, monkeypatch):
+    """Test tracing a machine whose id is not a valid trace id on its own."""
+    from app import routes
+    monkeypatch.setattr(routes, "TRACES_DIR", str(tmp_path))
+
+    res = client.post("/api/init", json={"machine": "EXAMPLE_9.2", "tape": "ab"})
+    machine_id = res.get_json()["machine_id"]
+    res = client.post("/api/trace", json={"machine_id": machine_id})
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["halted"] is True
+
+    res = client.get(f"/api/trace/{data['trace_id']}")
+    assert res.status_code == 200
+    assert res.get_json()["history"][-1]["step"] == data["records"] - 1
+
+
+def test_old_traces_are_pruned(client, tmp_path, monkeypatch):
+    """Test that only the most recent traces are kept on disk."""
+    from app import routes
+    monkeypatch.setattr(routes, "TRACES_DIR", str(tmp_path))
+    monkeypatch.setattr(routes, "TRACES_KEEP", 2)
+
+    res = client.post("/api/init", json={"machine": "binary_incrementer", "tape": "1"})
+    machine_id = res.get_json()["machine_id"]
+    trace_ids = []
+    for _ in range(3):
+        client.post("/api/reset", json={"machine_id": machine_id, "tape": "1"})
+        data = client.post("/api/trace", json={"machine_id": machine_id}).get_json()
+        trace_ids.append(data["trace_id"])
+        # mtime resolution can be coarse; make the recording order explicit
+        os.utime(tmp_path / f"{data['trace_id']}.trace", (len(trace_ids), len(trace_ids)))
+
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{t}.trace" for t in trace_ids[1:])
+
+
+def test_prune_ignores_traces_removed_concurrently(tmp_path, monkeypatch):
+    """Test that pruning tolerates files another request already deleted."""
+    from app import routes
+    monkeypatch.setattr(routes, "TRACES_DIR", str(tmp_path))
+    monkeypatch.setattr(routes, "TRACES_KEEP", 0)
+    (tmp_path / "old.trace").write_bytes(b"")
+
+    def remove_twice(path, _remove=os.remove):
+        _remove(path)
+        _remove(path)
+
+    monkeypatch.setattr(routes.os, "remove", remove_twice)
+    routes.prune_traces()
+    assert os.listdir(tmp_path) == []
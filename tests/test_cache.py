@@ -0,0 +1,139 @@
+import os
+
+import pytest
+from app.cache import RunCache, definition_hash
+from app.models import MoveDirection, Transition
+from app.utils import parse_machine_file, create_machine_from_dict, load_machine_file
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INCREMENTER = os.path.join(ROOT, "machines", "binary_incrementer.txt")
+
+
+def fresh_machine(tape="1011"):
+    machine = load_machine_file(INCREMENTER)
+    machine.reset(list(tape))
+    return machine
+
+
+def forbid_run(machine):
+    """Make machine.run fail so a test can assert execution was skipped."""
+    def run(max_steps=1000):
+        raise AssertionError("machine.run called on a cache hit")
+    machine.run = run
+
+
+def test_definition_hash_is_canonical():
+    """Test that equivalent definitions hash equal and different ones do not."""
+    streamed = load_machine_file(INCREMENTER).definition
+    from_dict = create_machine_from_dict(parse_machine_file(INCREMENTER)).definition
+    from_dict.transitions.reverse()
+    assert definition_hash(streamed) == definition_hash(from_dict)
+
+    from_dict.transitions[0] = Transition('q0', '0', 'q0', '1', MoveDirection.RIGHT)
+    assert definition_hash(streamed) != definition_hash(from_dict)
+
+
+def test_hit_skips_execution():
+    """Test that a repeated run is answered from the cache."""
+    cache = RunCache()
+    first = fresh_machine()
+    assert cache.run(first, 100) is True
+
+    second = fresh_machine()
+    forbid_run(second)
+    assert cache.run(second, 100) is True
+    assert second.tape == first.tape
+    assert second.state == first.state
+    assert second.history == first.history
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_halted_result_answers_larger_budget():
+    """Test that a halted run is reused for any larger budget."""
+    cache = RunCache()
+    cache.run(fresh_machine(), 100)
+
+    machine = fresh_machine()
+    forbid_run(machine)
+    assert cache.run(machine, 10**6) is True
+    assert machine.state.steps == 10
+
+
+def test_unhalted_result_needs_same_budget():
+    """Test that a run cut short by its budget only answers that budget."""
+    cache = RunCache()
+    assert cache.run(fresh_machine(), 3) is False
+
+    machine = fresh_machine()
+    assert cache.run(machine, 5) is False
+    assert machine.state.steps == 5
+    assert cache.hits == 0
+
+    machine = fresh_machine()
+    forbid_run(machine)
+    cache.run(machine, 3)
+    assert machine.state.steps == 3
+
+
+def test_different_tape_misses():
+    """Test that the initial tape is part of the key."""
+    cache = RunCache()
+    cache.run(fresh_machine("1"), 100)
+    cache.run(fresh_machine("11"), 100)
+    assert cache.hits == 0
+    assert cache.misses == 2
+
+
+def test_only_fresh_machines_are_cached():
+    """Test that a machine that has already stepped is run normally."""
+    cache = RunCache()
+    cache.run(fresh_machine(), 100)
+
+    machine = fresh_machine()
+    machine.step()
+    cache.run(machine, 100)
+    assert cache.hits == 0
+    assert machine.state.halted is True
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted."""
+    cache = RunCache(max_entries=2)
+    for tape in ("1", "10", "11"):
+        cache.run(fresh_machine(tape), 100)
+
+    cache.run(fresh_machine("1"), 100)
+    assert cache.hits == 0
+    cache.run(fresh_machine("11"), 100)
+    assert cache.hits == 1
+
+
+def test_sqlite_tier_persists(tmp_path):
+    """Test that results survive in the SQLite file across cache instances."""
+    path = str(tmp_path / "runs.sqlite")
+    cache = RunCache(path=path)
+    expected = fresh_machine()
+    cache.run(expected, 100)
+    cache.close()
+
+    cache = RunCache(path=path)
+    machine = fresh_machine()
+    forbid_run(machine)
+    cache.run(machine, 100)
+    assert machine.tape == expected.tape
+    assert machine.history == expected.history
+    cache.close()
+
+
+def test_result_without_history_is_not_reused_when_history_needed(tmp_path):
+    """Test that entries stored without history do not answer history users."""
+    path = str(tmp_path / "runs.sqlite")
+    cache = RunCache(path=path, store_history=False)
+    cache.run(fresh_machine(), 100)
+    cache.close()
+
+    cache = RunCache(path=path)
+    cache.run(fresh_machine(), 100)
+    assert cache.hits == 0
+    cache.close()
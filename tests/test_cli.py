@@ -0,0 +1,148 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from app import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INCREMENTER = os.path.join(ROOT, "machines", "binary_incrementer.txt")
+
+
+def read_ndjson(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_run_single_tape(capsys):
+    """Test running a machine on a tape given on the command line."""
+    assert cli.main(["run", INCREMENTER, "1011", "--max-steps", "100"]) == 0
+
+    [result] = read_ndjson(capsys.readouterr().out)
+    assert result["input"] == "1011"
+    assert result["halted"] is True
+    assert result["accepted"] is True
+    assert "".join(result["tape"]).strip("□") == "1100"
+
+
+def test_run_stops_at_max_steps(capsys):
+    """Test that the step budget is respected."""
+    cli.main(["run", INCREMENTER, "1011", "--max-steps", "2"])
+
+    [result] = read_ndjson(capsys.readouterr().out)
+    assert result["halted"] is False
+    assert result["steps"] == 2
+
+
+def test_run_batch_from_stdin(monkeypatch, capsys):
+    """Test batch mode emits one result per stdin line, in order."""
+    monkeypatch.setattr(sys, "stdin", io.StringIO("1\n11\n\n"))
+    assert cli.main(["run", INCREMENTER, "--batch"]) == 0
+
+    results = read_ndjson(capsys.readouterr().out)
+    assert [r["input"] for r in results] == ["1", "11", ""]
+    assert all(r["halted"] for r in results)
+
+
+def test_run_batch_with_workers(monkeypatch, capsys):
+    """Test batch mode with a worker pool matches the single-process output."""
+    tapes = "\n".join(format(i, "b") for i in range(20)) + "\n"
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO(tapes))
+    cli.main(["run", INCREMENTER, "--batch"])
+    serial = capsys.readouterr().out
+
+    monkeypatch.setattr(sys, "stdin", io.StringIO(tapes))
+    cli.main(["run", INCREMENTER, "--batch", "--jobs", "2"])
+    assert capsys.readouterr().out == serial
+
+
+def test_run_with_cache(tmp_path, capsys):
+    """Test that --cache reuses results across invocations."""
+    cache = str(tmp_path / "runs.sqlite")
+    cli.main(["run", INCREMENTER, "1011", "--cache", cache])
+    [first] = read_ndjson(capsys.readouterr().out)
+
+    cli.main(["run", INCREMENTER, "1011", "--cache", cache])
+    captured = capsys.readouterr()
+    [second] = read_ndjson(captured.out)
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["tape"] == first["tape"]
+    assert "1 hits, 0 misses" in captured.err
+
+
+def test_run_with_trace_and_replay(tmp_path, capsys):
+    """Test recording a trace from the command line and replaying part of it."""
+    trace = str(tmp_path / "run.trace")
+    assert cli.main(["run", INCREMENTER, "1011", "--trace", trace]) == 0
+    [result] = read_ndjson(capsys.readouterr().out)
+    assert result["trace"]["records"] == 11
+
+    assert cli.main(["replay", trace, "--start", "9", "--count", "5"]) == 0
+    entries = read_ndjson(capsys.readouterr().out)
+    assert [e["step"] for e in entries] == [9, 10]
+    assert entries[-1]["current_state"] == "halt"
+
+
+def test_run_invalid_tape_symbol(capsys):
+    """Test that a bad tape is reported in the output and the exit code."""
+    assert cli.main(["run", INCREMENTER, "12"]) == 1
+
+    [result] = read_ndjson(capsys.readouterr().out)
+    assert "not in tape alphabet" in result["error"]
+
+
+def test_unknown_machine(capsys):
+    """Test that a missing machine definition is reported on stderr."""
+    assert cli.main(["run", "no_such_machine", "1"]) == 1
+    assert "not found" in capsys.readouterr().err
+
+
+# Cold start budget for importing app.cli, i.e. CLI and pool worker startup.
+# benchmarks/bench_startup.py targets 50 ms; this leaves room for slow CI.
+CLI_IMPORT_BUDGET_MS = 100
+
+
+def cli_import_time_ms():
+    """Cumulative import time of app.cli in a fresh interpreter, from -X importtime."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.cli"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stderr
+    for line in stderr.splitlines():
+        fields = [part.strip() for part in line.split("|")]
+        if fields[-1] == "app.cli":
+            return int(fields[1]) / 1000
+    raise AssertionError("app.cli missing from -X importtime output")
+
+
+def test_cli_import_within_budget():
+    """Test that importing the CLI stays under its cold start budget."""
+    best = min(cli_import_time_ms() for _ in range(3))
+    assert best < CLI_IMPORT_BUDGET_MS
+
+
+@pytest.mark.parametrize("modules", [("app.cache", "sqlite3"), ("app.trace", "lzma", "mmap")])
+def test_cli_defers_optional_imports(modules):
+    """Test that runs without --cache or --trace do not load their backends."""
+    code = f"import sys, app.cli; print(sorted({set(modules)!r} & set(sys.modules)))"
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    assert out.strip() == "[]"
+
+
+@pytest.mark.parametrize("module", ["app.cli", "app.models", "app.utils"])
+def test_core_does_not_import_web_framework(module):
+    """Test that the simulator core starts without loading Flask and friends."""
+    code = (
+        f"import sys, {module}; "
+        "heavy = {'flask', 'werkzeug', 'jinja2'} & set(sys.modules); "
+        "print(','.join(sorted(heavy)))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    assert out.strip() == ""
@@ -218,4 +218,29 @@ def test_get_tape_snapshot(simple_machine_definition):
     snapshot = tm.get_tape_snapshot()
     assert snapshot['tape'] == ['0', '1', '_', '_']  # Includes blanks up to head
     assert snapshot['min_index'] == 0
-    assert snapshot['max_index'] == 3
\ No newline at end of file
+    assert snapshot['max_index'] == 3
+
+def test_transition_delta_and_immutability():
+    """Test that transitions carry a precomputed head delta and are frozen."""
+    right = Transition('q0', '0', 'q0', '0', MoveDirection.RIGHT)
+    left = Transition('q0', '0', 'q0', '0', MoveDirection.LEFT)
+    assert right.delta == 1
+    assert left.delta == -1
+    assert not hasattr(right, '__dict__')
+    with pytest.raises(AttributeError):
+        right.next_state = 'q1'
+
+def test_history_entries(simple_machine_definition):
+    """Test that history is recorded as compact tuples."""
+    tm = TuringMachine(simple_machine_definition)
+    tm.reset(initial_tape=['0', '1'])
+    tm.run(max_steps=1000)
+
+    assert len(tm.history) == 4  # initial snapshot + 3 steps
+    entry = tm.history[1]
+    assert isinstance(entry, tuple)
+    assert entry.step == 1
+    assert entry.head_position == 1
+    assert entry.current_symbol == '1'
+    assert entry.tape == ('0', '1')
+    assert (entry.min_index, entry.max_index) == (0, 1)
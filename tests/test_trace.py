@@ -0,0 +1,103 @@
+import os
+
+import pytest
+from app.trace import TraceReader, TraceWriter
+from app.utils import load_machine_file
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INCREMENTER = os.path.join(ROOT, "machines", "binary_incrementer.txt")
+ERASER = os.path.join(ROOT, "machines", "erase_tape.txt")
+
+
+def reference_history(path, tape, max_steps=1000):
+    machine = load_machine_file(path)
+    machine.reset(list(tape))
+    machine.run(max_steps)
+    return machine.history
+
+
+def record(path, trace_path, tape, max_steps=1000, **kwargs):
+    machine = load_machine_file(path)
+    machine.reset(list(tape))
+    machine.keep_history = False
+    with TraceWriter(trace_path, machine, **kwargs) as trace:
+        machine.run(max_steps)
+    return machine, trace
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+@pytest.mark.parametrize("machine_path, tape", [(INCREMENTER, "1011"), (ERASER, "1101")])
+def test_trace_matches_history(tmp_path, codec, machine_path, tape):
+    """Test that replaying a trace reproduces the in-memory history."""
+    trace_path = str(tmp_path / "run.trace")
+    machine, trace = record(machine_path, trace_path, tape, chunk_size=3, codec=codec)
+
+    assert len(machine.history) == 1  # only the snapshot taken by reset()
+    assert machine.recorder is None
+    expected = reference_history(machine_path, tape)
+    with TraceReader(trace_path) as reader:
+        assert len(reader) == trace.records == len(expected)
+        assert list(reader.entries()) == expected
+
+
+def test_random_access_and_pages(tmp_path):
+    """Test seeking to individual records and pages across chunk boundaries."""
+    trace_path = str(tmp_path / "run.trace")
+    record(INCREMENTER, trace_path, "10111", chunk_size=4)
+    expected = reference_history(INCREMENTER, "10111")
+
+    with TraceReader(trace_path) as reader:
+        for position in (9, 0, len(expected) - 1, 4, 3):
+            assert reader[position] == expected[position]
+        assert reader[-1] == expected[-1]
+        assert reader.page(1, 5) == expected[5:10]
+        assert reader.page(100, 5) == []
+        with pytest.raises(IndexError):
+            reader[len(expected)]
+
+
+def test_reset_while_recording(tmp_path):
+    """Test that a reset during recording starts a fresh keyframe."""
+    trace_path = str(tmp_path / "run.trace")
+    machine = load_machine_file(INCREMENTER)
+    machine.reset(list("11"))
+    with TraceWriter(trace_path, machine, chunk_size=100):
+        machine.run(3)
+        machine.reset(list("0"))
+        machine.run()
+
+    with TraceReader(trace_path) as reader:
+        entries = list(reader.entries())
+    assert entries[4:] == machine.history
+
+
+def test_incomplete_trace(tmp_path):
+    """Test that a trace that was never closed is rejected."""
+    trace_path = str(tmp_path / "run.trace")
+    machine = load_machine_file(INCREMENTER)
+    writer = TraceWriter(trace_path, machine)
+    writer._file.flush()
+
+    with pytest.raises(ValueError, match="incomplete"):
+        TraceReader(trace_path)
+    writer.close()
+
+
+@pytest.mark.parametrize("corrupt", ["codec", "chunk"])
+def test_corrupted_trace(tmp_path, corrupt):
+    """Test that an unreadable header or chunk is reported as an invalid trace."""
+    trace_path = str(tmp_path / "run.trace")
+    record(INCREMENTER, trace_path, "1011")
+    with open(trace_path, "rb") as f:
+        data = bytearray(f.read())
+    if corrupt == "codec":
+        data = data.replace(b'"zlib"', b'"zzzz"', 1)
+    else:
+        start = 12 + int.from_bytes(data[8:12], "little")
+        data[start:start + 4] = b"\xff" * 4
+    with open(trace_path, "wb") as f:
+        f.write(data)
+
+    with pytest.raises(ValueError, match="not a valid trace file"):
+        with TraceReader(trace_path) as reader:
+            list(reader.entries())
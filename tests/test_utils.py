@@ -0,0 +1,89 @@
+import pytest
+from app.models import MoveDirection
+from app.utils import parse_machine_definition, load_machine_file
+
+HEADER = """# Turing Machine: test
+states: q0,q1,halt
+input_alphabet: 0,1
+tape_alphabet: 0,1,_
+blank: _
+initial_state: q0
+final_states: halt
+transitions:
+"""
+
+
+@pytest.fixture
+def write_machine(tmp_path):
+    def write(text):
+        path = tmp_path / "machine.txt"
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+    return write
+
+
+def test_parse_machine_definition(write_machine):
+    """Test parsing a valid definition into a MachineDefinition with lookup table."""
+    path = write_machine(HEADER + "q0,0 -> q0,1,R\nq0,_ -> halt,_,L\n")
+    definition = parse_machine_definition(path)
+
+    assert definition.states == {'q0', 'q1', 'halt'}
+    assert definition.blank == '_'
+    assert len(definition.transitions) == 2
+    transition = definition.transition_table[('q0', '0')]
+    assert transition.write_symbol == '1'
+    assert transition.move == MoveDirection.RIGHT
+
+
+def test_load_machine_file_runs(write_machine):
+    """Test that a loaded machine uses the parsed transition table."""
+    path = write_machine(HEADER + "q0,0 -> q0,1,R\nq0,_ -> halt,_,L\n")
+    tm = load_machine_file(path)
+    tm.reset(['0', '0'])
+
+    assert tm.run() is True
+    assert tm.tape == {0: '1', 1: '1'}
+
+
+def test_repeated_transition_first_wins(write_machine):
+    """Test that a repeated (state, symbol) pair keeps the first transition."""
+    path = write_machine(HEADER + "q0,0 -> q0,1,R\nq0,0 -> halt,0,L\n")
+    definition = parse_machine_definition(path)
+
+    assert len(definition.transitions) == 2
+    assert definition.transition_table[('q0', '0')].write_symbol == '1'
+
+
+def test_transitions_before_headers(write_machine):
+    """Test that transitions may precede the header lines they depend on."""
+    path = write_machine("q0,0 -> q0,1,R\n" + HEADER)
+    assert len(parse_machine_definition(path).transitions) == 1
+
+
+@pytest.mark.parametrize("line, message", [
+    ("q0,0 -> q0,1", "Malformed transition line"),
+    ("q0,0 -> q0,1,X", "Invalid move direction 'X'"),
+    ("q9,0 -> q0,1,R", "Transition state 'q9' not in states"),
+    ("q0,2 -> q0,1,R", "Read symbol '2' not in tape alphabet"),
+    ("states: q0", "Duplicate 'states' declaration"),
+    ("q0 q0", "Unrecognized line"),
+])
+def test_errors_report_line_number(write_machine, line, message):
+    """Test that errors point at the offending line."""
+    path = write_machine(HEADER + "q0,0 -> q0,1,R\n" + line + "\n")
+    with pytest.raises(ValueError, match=f"line 10: {message}"):
+        parse_machine_definition(path)
+
+
+def test_pending_transition_error_reports_line_number(write_machine):
+    """Test that deferred validation still reports the original line."""
+    path = write_machine("\nq0,2 -> q0,1,R\n" + HEADER)
+    with pytest.raises(ValueError, match="line 2: Read symbol '2'"):
+        parse_machine_definition(path)
+
+
+def test_missing_header(write_machine):
+    """Test that a missing declaration is reported."""
+    path = write_machine(HEADER.replace("blank: _\n", ""))
+    with pytest.raises(ValueError, match="Missing 'blank' declaration"):
+        parse_machine_definition(path)